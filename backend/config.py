@@ -3,6 +3,8 @@ Configuration management for FinePrint backend.
 Loads environment variables and provides application settings.
 """
 
+from functools import cached_property, lru_cache
+
 from pydantic_settings import BaseSettings
 from typing import List
 
@@ -13,33 +15,62 @@ class Settings(BaseSettings):
     # OpenAI Configuration
     openai_api_key: str
     openai_model: str = "gpt-4o"
+    # Token budget for scraped text sent to the model, leaving headroom
+    # for prompt overhead (~2k tokens) and the response (~2k tokens)
+    # under the organization's 30k tokens-per-minute limit
+    max_input_tokens: int = 15000
 
     # Server Configuration
     port: int = 8001
     host: str = "0.0.0.0"
     debug: bool = True
     disable_scan_limits: bool = True  # Set to False in production
+    log_level: str = "INFO"  # Set to WARNING in production to skip per-request INFO lines
 
     # Database
     database_url: str = "sqlite:///./fineprint.db"
 
+    # Analysis result cache
+    analysis_cache_l2_enabled: bool = False  # Enable shared Redis cache tier
+    redis_url: str = "redis://localhost:6379/0"
+
+    # Scan quota backend: Redis counters instead of the users table
+    use_redis_quota: bool = False
+
     # Scraping Configuration
     enable_dynamic_scraping: bool = True
     dynamic_scraping_timeout: int = 10  # seconds
     static_content_threshold: int = 200  # minimum chars to consider valid static scrape
+    max_html_bytes: int = 2_000_000  # stop downloading a page beyond this size
+    browser_profile_dir: str = "./pw-profile"  # persistent Chromium profile (HTTP cache reuse)
 
     # CORS
+    # allow_origins does literal string comparison, so wildcard ports need
+    # a regex; compiled once by Starlette and matched per preflight
+    cors_origin_regex: str = r"^https?://(localhost|127\.0\.0\.1)(:\d+)?$"
     cors_origins: str = "http://localhost:*,http://127.0.0.1:*"
 
     class Config:
         env_file = ".env"
         case_sensitive = False
 
-    @property
+    @cached_property
     def cors_origins_list(self) -> List[str]:
-        """Parse CORS origins from comma-separated string."""
+        """Parse CORS origins from comma-separated string (computed once)."""
         return [origin.strip() for origin in self.cors_origins.split(",")]
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Settings factory for FastAPI dependency injection.
+
+    Cached so env parsing and Pydantic validation run once per process;
+    request handlers should take `settings: Settings = Depends(get_settings)`
+    rather than importing the module-level instance.
+    """
+    return Settings()
+
+
+# Global settings instance (startup-time configuration)
+settings = get_settings()
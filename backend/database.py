@@ -3,23 +3,49 @@ Database models and session management for FinePrint backend.
 Manages user scan limits and usage tracking.
 """
 
-from sqlalchemy import create_engine, Column, String, Boolean, Integer, Date
+from sqlalchemy import create_engine, event, text, Column, String, Boolean, Integer, Date
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from datetime import date
 
 from config import settings
 
-# Create database engine with conditional connect_args
-# SQLite needs check_same_thread=False, but PostgreSQL doesn't support it
-connect_args = {}
+# Create database engine with pooling tuned per backend.
+# SQLite: the default pool opens a fresh file connection on every request;
+# StaticPool keeps a single connection alive instead (check_same_thread=False
+# is required to share it across FastAPI's threadpool).
+# PostgreSQL: a sized QueuePool with pre-ping (drops dead connections) and
+# hourly recycling, so requests reuse warm connections instead of paying
+# the connect/handshake cost each time.
 if settings.database_url.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
-
-engine = create_engine(
-    settings.database_url,
-    connect_args=connect_args
-)
+    engine = create_engine(
+        settings.database_url,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+
+    # Tune SQLite once per physical connection. The defaults
+    # (journal_mode=DELETE, synchronous=FULL) fsync on every commit and
+    # block readers while the scan counter is being written; WAL lets
+    # reads and the counter write proceed concurrently.
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256MB
+        cursor.execute("PRAGMA cache_size=-64000")  # 64MB
+        cursor.close()
+else:
+    engine = create_engine(
+        settings.database_url,
+        pool_size=10,
+        max_overflow=20,
+        pool_pre_ping=True,
+        pool_recycle=3600
+    )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -42,6 +68,24 @@ class User(Base):
         return f"<User(user_id={self.user_id}, is_paid={self.is_paid}, scans_today={self.daily_scan_count})>"
 
 
+class PaidUser(Base):
+    """
+    Presence table for paid subscriptions: a row existing means paid.
+
+    Split out from User so the read-mostly paid check queries a tiny
+    PK-only table that stays resident in cache, separate from the
+    write-heavy scan counters. Used by the Redis quota path; the users
+    table keeps its is_paid column for the SQL quota path.
+    """
+
+    __tablename__ = "paid_users"
+
+    user_id = Column(String, primary_key=True, index=True)
+
+    def __repr__(self):
+        return f"<PaidUser(user_id={self.user_id})>"
+
+
 def init_db():
     """Initialize database tables."""
     Base.metadata.create_all(bind=engine)
@@ -58,7 +102,9 @@ def get_db():
 
 def get_or_create_user(db, user_id: str) -> User:
     """Get existing user or create new one."""
-    user = db.query(User).filter(User.user_id == user_id).first()
+    # Session.get uses the identity map and a cached compiled query,
+    # skipping per-call statement compilation for this primary-key lookup
+    user = db.get(User, user_id)
 
     if not user:
         user = User(
@@ -74,9 +120,33 @@ def get_or_create_user(db, user_id: str) -> User:
     return user
 
 
-def check_scan_limit(db, user_id: str) -> tuple[bool, str]:
+# Free users: 1 scan per day
+FREE_DAILY_SCAN_LIMIT = 1
+
+# Single statement that checks the limit and claims the scan atomically.
+# The WHERE clause only matches when the user may scan (paid, under the
+# daily limit, or first scan of a new day), so no row updated = limit hit.
+# Requires UPDATE...RETURNING (PostgreSQL, SQLite 3.35+).
+_RESERVE_SCAN_SQL = text(
+    "UPDATE users "
+    "SET daily_scan_count = CASE WHEN last_scan_date = :today THEN daily_scan_count + 1 ELSE 1 END, "
+    "    last_scan_date = :today "
+    "WHERE user_id = :user_id "
+    "  AND (is_paid "
+    "       OR daily_scan_count < :limit "
+    "       OR last_scan_date IS NULL "
+    "       OR last_scan_date <> :today) "
+    "RETURNING daily_scan_count, is_paid"
+)
+
+
+def reserve_scan(db, user_id: str) -> tuple[bool, str]:
     """
-    Check if user can perform a scan.
+    Atomically check the scan limit and claim a scan in one statement.
+
+    Replaces the old check_scan_limit + increment_scan_count pair: a single
+    conditional UPDATE both validates the limit and bumps the counter, so
+    two concurrent requests can't both pass the check before either counts.
 
     Returns:
         (can_scan: bool, message: str)
@@ -85,42 +155,27 @@ def check_scan_limit(db, user_id: str) -> tuple[bool, str]:
     if settings.disable_scan_limits:
         return True, "Scan limits disabled for testing"
 
-    user = get_or_create_user(db, user_id)
-
     # Developer/admin user always has unlimited scans
     # You can add your device's user_id here for unlimited access
     if user_id.startswith("admin_") or user_id.startswith("dev_"):
         return True, "Developer unlimited scans"
 
-    # Paid users have unlimited scans
-    if user.is_paid:
-        return True, "Unlimited scans available"
-
-    # Free users: 1 scan per day
-    today = date.today()
+    # Make sure the row exists before the conditional UPDATE
+    get_or_create_user(db, user_id)
 
-    # Reset counter if it's a new day
-    if user.last_scan_date != today:
-        user.last_scan_date = today
-        user.daily_scan_count = 0
-        db.commit()
+    row = db.execute(
+        _RESERVE_SCAN_SQL,
+        {"today": date.today(), "user_id": user_id, "limit": FREE_DAILY_SCAN_LIMIT}
+    ).first()
+    db.commit()
 
-    # Check if limit reached
-    if user.daily_scan_count >= 1:
+    if row is None:
         return False, "You have used your 1 free scan for today. Upgrade to get unlimited scans."
 
-    return True, f"Free scan available ({1 - user.daily_scan_count} remaining today)"
-
+    scan_count, is_paid = row
 
-def increment_scan_count(db, user_id: str):
-    """Increment user's scan count for today."""
-    user = get_or_create_user(db, user_id)
-    today = date.today()
-
-    if user.last_scan_date != today:
-        user.last_scan_date = today
-        user.daily_scan_count = 1
-    else:
-        user.daily_scan_count += 1
+    if is_paid:
+        return True, "Unlimited scans available"
 
-    db.commit()
+    remaining = max(FREE_DAILY_SCAN_LIMIT - scan_count, 0)
+    return True, f"Free scan available ({remaining} remaining today)"
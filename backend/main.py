@@ -7,19 +7,22 @@ It provides endpoints for analyzing promotional offers and fine print.
 
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 import uvicorn
 import logging
 
-from config import settings
-from database import init_db, get_db, check_scan_limit, increment_scan_count, User
-from models import AnalyzeRequest, AnalyzeResponse, ErrorResponse, AnalysisResult
-from services.scraper_service import scrape_page_async, clean_and_deduplicate_text, ScraperMode
+from config import settings, Settings, get_settings
+from database import init_db, get_db, reserve_scan, User
+from models import AnalyzeRequest, AnalyzeResponse, ErrorResponse
+from services.scraper_service import scrape_page_async, clean_and_deduplicate_text, shutdown_browser, ScraperMode
 from services.openai_service import analyze_fine_print
+from services.quota import try_consume_scan
 
-# Configure logging
+# Configure logging. Log calls use lazy %-style arguments so message
+# formatting is skipped entirely when the record is below LOG_LEVEL.
 logging.basicConfig(
-    level=logging.INFO,
+    level=settings.log_level.upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
@@ -29,15 +32,20 @@ app = FastAPI(
     title="FinePrint API",
     description="Backend service for analyzing promotional offers and fine print",
     version="1.0.0",
-    debug=settings.debug
+    debug=settings.debug,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
 # In production, this will be restricted to the Railway domain
-# In development, allows all origins for testing
+# In development, allows all origins for testing.
+# Literal entries from CORS_ORIGINS (e.g. the Railway domain) still match
+# via allow_origins; the compiled regex covers wildcard-port entries like
+# "http://localhost:*", which literal equality never matched.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.cors_origins_list if not settings.debug else ["*"],
+    allow_origins=["*"] if settings.debug else settings.cors_origins_list,
+    allow_origin_regex=None if settings.debug else settings.cors_origin_regex,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -53,6 +61,12 @@ async def startup_event():
     logger.info("Database initialized successfully")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the shared Playwright browser on shutdown."""
+    await shutdown_browser()
+
+
 @app.get("/")
 async def root():
     """Root endpoint - API information."""
@@ -68,7 +82,7 @@ async def root():
 
 
 @app.get("/health")
-async def health_check():
+async def health_check(settings: Settings = Depends(get_settings)):
     """Health check endpoint for monitoring."""
     return {
         "status": "healthy",
@@ -84,7 +98,7 @@ async def reset_user_scans(user_id: str, db: Session = Depends(get_db)):
     DEBUG ONLY: Reset a user's scan count.
     Use this during development to test scan limits.
     """
-    user = db.query(User).filter(User.user_id == user_id).first()
+    user = db.get(User, user_id)
 
     if user:
         user.daily_scan_count = 0
@@ -98,24 +112,31 @@ async def reset_user_scans(user_id: str, db: Session = Depends(get_db)):
 @app.post("/analyze/url", response_model=AnalyzeResponse)
 async def analyze_url(
     request: AnalyzeRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    settings: Settings = Depends(get_settings)
 ):
     """
     Analyze a promotional offer from a URL.
 
     This endpoint:
-    1. Checks user's scan limit (free vs paid)
+    1. Checks user's scan limit (free vs paid) and claims the scan
     2. Scrapes the provided URL for fine print
     3. Uses OpenAI to analyze and summarize the terms
     4. Returns structured analysis with risk scores
     """
     try:
-        logger.info(f"Analyzing URL for user {request.user_id}: {request.url}")
-
-        # Check scan limit
-        can_scan, limit_message = check_scan_limit(db, request.user_id)
+        logger.info("Analyzing URL for user %s: %s", request.user_id, request.url)
+
+        # Atomically check the scan limit and claim this scan.
+        # Redis counters keep the SQL write off the hot path entirely;
+        # the single-statement SQL path is the default for deployments
+        # without Redis.
+        if settings.use_redis_quota:
+            can_scan, limit_message = await try_consume_scan(db, request.user_id)
+        else:
+            can_scan, limit_message = reserve_scan(db, request.user_id)
         if not can_scan:
-            logger.warning(f"Scan limit reached for user {request.user_id}")
+            logger.warning("Scan limit reached for user %s", request.user_id)
             raise HTTPException(
                 status_code=429,
                 detail={
@@ -125,11 +146,11 @@ async def analyze_url(
             )
 
         # Scrape the URL (uses AUTO mode: tries static first, falls back to dynamic if needed)
-        logger.info(f"Scraping URL: {request.url}")
+        logger.info("Scraping URL: %s", request.url)
         scrape_result = await scrape_page_async(request.url, mode=ScraperMode.AUTO)
 
         if not scrape_result.success:
-            logger.error(f"Scraping failed: {scrape_result.error}")
+            logger.error("Scraping failed: %s", scrape_result.error)
             raise HTTPException(
                 status_code=422,
                 detail={
@@ -144,8 +165,9 @@ async def analyze_url(
         # Check if we got enough content (even after auto-fallback to dynamic scraping)
         if len(cleaned_text) < settings.static_content_threshold:
             logger.warning(
-                f"Scraped content too short ({len(cleaned_text)} chars) even after attempting dynamic scraping. "
-                f"This page may be heavily protected or empty."
+                "Scraped content too short (%d chars) even after attempting dynamic scraping. "
+                "This page may be heavily protected or empty.",
+                len(cleaned_text)
             )
             raise HTTPException(
                 status_code=422,
@@ -157,17 +179,11 @@ async def analyze_url(
                 }
             )
 
-        # Analyze with OpenAI
+        # Analyze with OpenAI (returns a validated AnalysisResult)
         logger.info("Sending to OpenAI for analysis...")
-        analysis_dict = analyze_fine_print(cleaned_text)
-
-        # Convert to Pydantic model
-        analysis_result = AnalysisResult(**analysis_dict)
-
-        # Increment scan count
-        increment_scan_count(db, request.user_id)
+        analysis_result = await analyze_fine_print(cleaned_text)
 
-        logger.info(f"Analysis complete for user {request.user_id}")
+        logger.info("Analysis complete for user %s", request.user_id)
 
         return AnalyzeResponse(
             success=True,
@@ -178,7 +194,7 @@ async def analyze_url(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Analysis failed: {str(e)}", exc_info=True)
+        logger.error("Analysis failed: %s", str(e), exc_info=True)
         raise HTTPException(
             status_code=500,
             detail={
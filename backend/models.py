@@ -2,7 +2,7 @@
 Pydantic models for request/response validation.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import List, Optional
 from enum import Enum
 
@@ -40,6 +40,32 @@ class AnalysisResult(BaseModel):
     risk_score_explanation: Optional[str] = Field(None, alias="riskScoreExplanation")
     clarity_score_explanation: Optional[str] = Field(None, alias="clarityScoreExplanation")
 
+    @model_validator(mode="before")
+    @classmethod
+    def _default_difficulty(cls, data):
+        """
+        Coerce unexpected cancellation difficulty values to Medium.
+
+        Only values that are present but outside the enum are defaulted;
+        a missing field still fails required-field validation.
+        """
+        if isinstance(data, dict) and (
+                "cancellationDifficulty" in data or "cancellation_difficulty" in data):
+            difficulty = data.get("cancellationDifficulty", data.get("cancellation_difficulty"))
+            if difficulty not in ("Easy", "Medium", "Hard"):
+                data = dict(data)
+                data.pop("cancellation_difficulty", None)
+                data["cancellationDifficulty"] = "Medium"
+        return data
+
+    @field_validator("risk_score", "clarity_score", mode="before")
+    @classmethod
+    def _clamp_score(cls, value):
+        """Clamp out-of-range scores instead of rejecting the response."""
+        if isinstance(value, (int, float)):
+            return max(0, min(100, int(value)))
+        return value
+
     class Config:
         populate_by_name = True
         json_schema_extra = {
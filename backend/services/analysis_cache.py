@@ -0,0 +1,191 @@
+"""
+Content-addressed cache for fine print analysis results.
+
+OpenAI latency dominates the cost of /analyze/url and every call is billable,
+so identical cleaned text should never be analyzed twice. Results are cached
+by content hash in two tiers: an in-process TTL cache (L1) that answers
+repeats on the same worker, and an optional shared Redis cache (L2) for
+multi-worker deployments, enabled via ANALYSIS_CACHE_L2_ENABLED.
+
+Failures (invalid JSON, missing fields) are negatively cached with a short
+TTL so a pathological page doesn't thrash the model but recovers quickly.
+
+Cache misses are additionally protected against stampedes: run_once()
+guarantees that only one coroutine per key executes the expensive model
+call, with an in-process future map for this worker and a short-lived
+Redis lock across workers.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, Optional
+
+import orjson
+from cachetools import TTLCache
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Key prefix - bump the version to invalidate all cached analyses at once
+CACHE_PREFIX = "v1:analysis"
+
+# Positive entries live for a day; negative entries only briefly
+ANALYSIS_TTL = 86400  # seconds
+NEGATIVE_TTL = 60  # seconds
+
+# L1: per-worker in-memory caches. Separate cache for failures since
+# TTLCache has a single TTL per instance.
+_l1: TTLCache = TTLCache(maxsize=10_000, ttl=ANALYSIS_TTL)
+_l1_failures: TTLCache = TTLCache(maxsize=1_000, ttl=NEGATIVE_TTL)
+
+# L2: lazily-created Redis client, shared across workers
+_redis = None
+
+# Singleflight state: in-flight futures for this worker, and an identifier
+# for the cross-worker Redis lock
+LOCK_TTL = 30  # seconds - bounds how long a crashed lock holder blocks others
+_inflight: Dict[str, asyncio.Future] = {}
+_WORKER_ID = uuid.uuid4().hex
+
+
+def make_cache_key(cleaned_text: str, model: str) -> str:
+    """Build the cache key for a (text, model) pair."""
+    digest = hashlib.sha256(cleaned_text.encode()).hexdigest()
+    return f"{CACHE_PREFIX}:{model}:{digest}"
+
+
+def _get_redis():
+    """Get the shared Redis client, or None if L2 caching is disabled."""
+    global _redis
+
+    if not settings.analysis_cache_l2_enabled:
+        return None
+
+    if _redis is None:
+        import redis.asyncio as redis
+        _redis = redis.from_url(settings.redis_url, decode_responses=True)
+        logger.info("Analysis cache L2 (Redis) enabled")
+
+    return _redis
+
+
+async def get_cached_analysis(key: str) -> Optional[Dict]:
+    """
+    Look up a cached analysis, checking L1 then L2.
+
+    L2 hits are promoted into L1 so subsequent lookups on this worker
+    stay in-process.
+    """
+    analysis = _l1.get(key)
+    if analysis is not None:
+        logger.info("Analysis cache hit (L1)")
+        return analysis
+
+    redis_client = _get_redis()
+    if redis_client is not None:
+        try:
+            payload = await redis_client.get(key)
+        except Exception as e:
+            logger.warning("Analysis cache L2 read failed: %s", str(e))
+            payload = None
+
+        if payload:
+            logger.info("Analysis cache hit (L2)")
+            analysis = orjson.loads(payload)
+            _l1[key] = analysis
+            return analysis
+
+    return None
+
+
+async def store_analysis(key: str, analysis: Dict):
+    """Store a successful analysis in both cache tiers."""
+    _l1[key] = analysis
+
+    redis_client = _get_redis()
+    if redis_client is not None:
+        try:
+            await redis_client.set(key, orjson.dumps(analysis), ex=ANALYSIS_TTL)
+        except Exception as e:
+            logger.warning("Analysis cache L2 write failed: %s", str(e))
+
+
+async def run_once(key: str, compute: Callable[[], Awaitable[Dict]]) -> Dict:
+    """
+    Execute `compute` with singleflight semantics for `key`.
+
+    If another coroutine on this worker is already computing the same key,
+    await its result instead of issuing a second model call. Across workers,
+    a Redis lock (when L2 is enabled) elects one winner; losers poll the
+    shared cache until the result lands.
+    """
+    existing = _inflight.get(key)
+    if existing is not None:
+        logger.info("Awaiting in-flight analysis for identical content")
+        return await asyncio.shield(existing)
+
+    future: asyncio.Future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        result = await _run_with_l2_lock(key, compute)
+    except BaseException as e:
+        future.set_exception(e)
+        future.exception()  # mark retrieved in case no one else is waiting
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        _inflight.pop(key, None)
+
+
+async def _run_with_l2_lock(key: str, compute: Callable[[], Awaitable[Dict]]) -> Dict:
+    """Run `compute` behind a cross-worker Redis lock when L2 is enabled."""
+    redis_client = _get_redis()
+    if redis_client is None:
+        return await compute()
+
+    lock_key = f"{key}:lock"
+    try:
+        acquired = await redis_client.set(lock_key, _WORKER_ID, nx=True, ex=LOCK_TTL)
+    except Exception as e:
+        logger.warning("Analysis cache L2 lock failed, proceeding unlocked: %s", str(e))
+        return await compute()
+
+    if acquired:
+        try:
+            return await compute()
+        finally:
+            try:
+                await redis_client.delete(lock_key)
+            except Exception:
+                pass
+
+    # Another worker holds the lock: poll the shared cache with backoff
+    # until its result lands or the lock expires, then compute ourselves.
+    logger.info("Another worker is analyzing identical content, polling cache")
+    deadline = time.monotonic() + LOCK_TTL
+    delay = 0.25
+    while time.monotonic() < deadline:
+        await asyncio.sleep(delay)
+        cached = await get_cached_analysis(key)
+        if cached is not None:
+            return cached
+        delay = min(delay * 2, 2.0)
+
+    logger.warning("Lock holder never populated the cache, computing locally")
+    return await compute()
+
+
+def get_cached_failure(key: str) -> Optional[str]:
+    """Return the cached failure message for this key, if any."""
+    return _l1_failures.get(key)
+
+
+def store_failure(key: str, message: str):
+    """Negatively cache a failed analysis so retries back off briefly."""
+    _l1_failures[key] = message
@@ -3,17 +3,35 @@ OpenAI Service for analyzing fine print using GPT-4o.
 Provides structured analysis with risk scoring and red flag detection.
 """
 
-from openai import OpenAI
+from functools import lru_cache
+
+import orjson
+import tiktoken
+from openai import AsyncOpenAI
+from pydantic import ValidationError
 from typing import Dict, List
-import json
 import logging
 
 from config import settings
+from models import AnalysisResult
+from services import analysis_cache
 
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
-client = OpenAI(api_key=settings.openai_api_key)
+# Initialize OpenAI client once at module load.
+# The async client keeps an internal httpx connection pool, so reusing it
+# across requests avoids per-call TCP/TLS setup and doesn't block the event loop.
+client = AsyncOpenAI(api_key=settings.openai_api_key)
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Tokenizer for input truncation, loaded once per process."""
+    try:
+        return tiktoken.encoding_for_model(settings.openai_model)
+    except KeyError:
+        # Model name unknown to tiktoken - use the common modern encoding
+        return tiktoken.get_encoding("cl100k_base")
 
 
 ANALYSIS_PROMPT = """You are a consumer protection expert analyzing promotional offers and their fine print. Your job is to help regular people understand what they're really signing up for.
@@ -69,8 +87,43 @@ Be honest and direct. If something seems designed to trick people, say so. Consu
 Respond ONLY with valid JSON, no additional text.
 """
 
-
-def analyze_fine_print(combined_text: str) -> Dict:
+# Inputs below these bounds aren't worth a model call - typically error
+# pages or repetitive boilerplate that narrowly cleared the scraper's
+# content threshold
+MIN_USEFUL_CHARS = 120
+MIN_UNIQUE_TOKENS = 20
+
+# Canned result returned for degenerate input, skipping the OpenAI call
+_LOW_CONTENT_RESULT = {
+    "offerSummary": "Not enough content was found on this page to identify a promotional offer.",
+    "plainEnglishSummary": "The page didn't contain enough readable text to analyze. "
+                           "It may be an error page, a mostly empty page, or one that blocks scraping.",
+    "hiddenRequirements": [],
+    "redFlags": [],
+    "riskScore": 0,
+    "clarityScore": 0,
+    "cancellationDifficulty": "Medium",
+    "riskScoreExplanation": "No analysis performed - the scraped content was too sparse to evaluate.",
+    "clarityScoreExplanation": "No analysis performed - the scraped content was too sparse to evaluate."
+}
+
+# Invariant request pieces, built once instead of per call
+_SYSTEM_MSG = {
+    "role": "system",
+    "content": "You are a consumer protection expert. You analyze promotional offers and fine print to help people make informed decisions. Always respond with valid JSON."
+}
+_RESPONSE_FORMAT = {"type": "json_object"}  # Force JSON response
+
+# Split the template once at import time so each request is two string
+# concatenations instead of str.format re-scanning the multi-KB template
+# (including all the escaped {{ }} braces in the JSON example) per call.
+_PROMPT_PREFIX, _PROMPT_SUFFIX = (
+    part.replace("{{", "{").replace("}}", "}")
+    for part in ANALYSIS_PROMPT.split("{input_text}", 1)
+)
+
+
+async def analyze_fine_print(combined_text: str) -> AnalysisResult:
     """
     Analyze fine print using GPT-4o.
 
@@ -78,82 +131,104 @@ def analyze_fine_print(combined_text: str) -> Dict:
         combined_text: Combined text from image OCR and web scraping
 
     Returns:
-        Structured analysis dictionary
+        Validated AnalysisResult
     """
+    # Short-circuit degenerate input before hashing, caching, or prompting:
+    # pages that narrowly passed the scraper's length threshold can still
+    # be junk, and a full OpenAI round-trip on them is pure waste
+    if (len(combined_text) < MIN_USEFUL_CHARS
+            or len(set(combined_text.split())) < MIN_UNIQUE_TOKENS):
+        logger.warning("Content too sparse to analyze (%d chars), skipping OpenAI call", len(combined_text))
+        return AnalysisResult.model_validate(_LOW_CONTENT_RESULT)
+
+    # Check the content-addressed cache before doing any work.
+    # Identical cleaned text always produces an equivalent analysis,
+    # so repeated/viral URLs skip the OpenAI round-trip entirely.
+    cache_key = analysis_cache.make_cache_key(combined_text, settings.openai_model)
+
+    cached_failure = analysis_cache.get_cached_failure(cache_key)
+    if cached_failure is not None:
+        logger.warning("Returning negatively cached analysis failure")
+        raise Exception(cached_failure)
+
+    cached = await analysis_cache.get_cached_analysis(cache_key)
+    if cached is not None:
+        return AnalysisResult.model_validate(cached)
+
+    # Singleflight: if several requests miss on the same content at once
+    # (e.g. a viral promo URL), only one of them calls OpenAI; the rest
+    # await that result.
+    analysis_dict = await analysis_cache.run_once(
+        cache_key,
+        lambda: _analyze_uncached(combined_text, cache_key)
+    )
+    return AnalysisResult.model_validate(analysis_dict)
+
+
+async def _analyze_uncached(combined_text: str, cache_key: str) -> Dict:
+    """Perform the actual OpenAI call and populate the cache."""
     try:
-        logger.info(f"Sending {len(combined_text)} characters to OpenAI for analysis...")
-
-        # Truncate if too long to fit within organization's token limit
-        # Organization limit: 30,000 tokens per minute (TPM)
-        # Rough estimate: 1 token ≈ 4 characters
-        # Account for prompt overhead (~2000 tokens) and response (~2000 tokens)
-        # Safe limit for input text to stay under 30k tokens: (30000 - 4000) * 4 = 104,000 chars
-        # Using 60,000 chars to be extra safe and avoid rate limits
-        max_chars = 60000
-        if len(combined_text) > max_chars:
-            logger.warning(f"Text too long ({len(combined_text)} chars), truncating to {max_chars}")
-            combined_text = combined_text[:max_chars] + "\n\n[... content truncated due to length ...]"
-
-        # Create the prompt
-        prompt = ANALYSIS_PROMPT.format(input_text=combined_text)
-
-        # Call OpenAI API
-        response = client.chat.completions.create(
+        logger.info("Sending %d characters to OpenAI for analysis...", len(combined_text))
+
+        # Truncate by real token count rather than a chars-per-token guess:
+        # character limits waste budget on token-dense English and
+        # underestimate CJK/code-heavy pages, risking rate-limit errors
+        encoding = _get_encoding()
+        tokens = encoding.encode(combined_text)
+        if len(tokens) > settings.max_input_tokens:
+            logger.warning("Text too long (%d tokens), truncating to %d", len(tokens), settings.max_input_tokens)
+            combined_text = (
+                encoding.decode(tokens[:settings.max_input_tokens])
+                + "\n\n[... content truncated due to length ...]"
+            )
+
+        # Create the prompt from the precomputed template halves
+        prompt = _PROMPT_PREFIX + combined_text + _PROMPT_SUFFIX
+
+        # Call OpenAI API with streaming so we receive tokens as they are
+        # generated instead of waiting for the full payload to assemble
+        # before the first byte arrives
+        stream = await client.chat.completions.create(
             model=settings.openai_model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a consumer protection expert. You analyze promotional offers and fine print to help people make informed decisions. Always respond with valid JSON."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
+            messages=[_SYSTEM_MSG, {"role": "user", "content": prompt}],
             temperature=0.3,  # Lower temperature for more consistent, factual analysis
-            response_format={"type": "json_object"}  # Force JSON response
+            response_format=_RESPONSE_FORMAT,
+            stream=True
         )
 
-        # Parse response
-        result_text = response.choices[0].message.content
-        logger.info(f"Received response from OpenAI: {len(result_text)} characters")
+        # Accumulate the streamed deltas into the response text
+        chunks = []
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                chunks.append(chunk.choices[0].delta.content)
 
-        # Parse JSON
-        analysis = json.loads(result_text)
+        result_text = ''.join(chunks)
+        logger.info("Received response from OpenAI: %d characters", len(result_text))
 
-        # Validate required fields
-        required_fields = [
-            'offerSummary', 'plainEnglishSummary', 'hiddenRequirements',
-            'redFlags', 'riskScore', 'clarityScore', 'cancellationDifficulty'
-        ]
+        # Parse and validate in one pass: AnalysisResult checks required
+        # fields, clamps scores, and defaults bad difficulty values in
+        # Pydantic's Rust core, replacing the old hand-rolled checks here
+        # and the second validation pass in main.py
+        analysis = AnalysisResult.model_validate(orjson.loads(result_text))
 
-        for field in required_fields:
-            if field not in analysis:
-                logger.error(f"Missing required field: {field}")
-                raise ValueError(f"OpenAI response missing required field: {field}")
+        logger.info("Analysis complete: Risk=%s, Clarity=%s", analysis.risk_score, analysis.clarity_score)
 
-        # Validate score ranges
-        if not (0 <= analysis['riskScore'] <= 100):
-            analysis['riskScore'] = max(0, min(100, analysis['riskScore']))
+        payload = analysis.model_dump(by_alias=True)
+        await analysis_cache.store_analysis(cache_key, payload)
+        return payload
 
-        if not (0 <= analysis['clarityScore'] <= 100):
-            analysis['clarityScore'] = max(0, min(100, analysis['clarityScore']))
-
-        # Validate cancellation difficulty
-        valid_difficulties = ['Easy', 'Medium', 'Hard']
-        if analysis['cancellationDifficulty'] not in valid_difficulties:
-            logger.warning(f"Invalid cancellation difficulty: {analysis['cancellationDifficulty']}, defaulting to Medium")
-            analysis['cancellationDifficulty'] = 'Medium'
-
-        logger.info(f"Analysis complete: Risk={analysis['riskScore']}, Clarity={analysis['clarityScore']}")
-        return analysis
-
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse OpenAI response as JSON: {str(e)}")
+    except orjson.JSONDecodeError as e:
+        logger.error("Failed to parse OpenAI response as JSON: %s", str(e))
+        analysis_cache.store_failure(cache_key, "OpenAI returned invalid JSON response")
         raise Exception("OpenAI returned invalid JSON response")
 
+    except ValidationError as e:
+        logger.error("OpenAI response failed validation: %s", str(e))
+        analysis_cache.store_failure(cache_key, "OpenAI response was missing required analysis fields")
+        raise Exception("OpenAI response was missing required analysis fields")
+
     except Exception as e:
-        logger.error(f"OpenAI analysis failed: {str(e)}")
+        logger.error("OpenAI analysis failed: %s", str(e))
         raise Exception(f"Failed to analyze fine print: {str(e)}")
 
 
@@ -0,0 +1,101 @@
+"""
+Redis-backed scan quota tracking.
+
+The users table was written on every /analyze/url call purely to maintain a
+daily integer counter - a poor fit for a relational table. When
+USE_REDIS_QUOTA is enabled, daily scan counts live in Redis instead
+(one INCR on a per-user per-day key, sub-millisecond) and the database is
+only consulted for paid status, which is itself cached for 60 seconds.
+"""
+
+import logging
+from datetime import date
+
+from cachetools import TTLCache
+
+from config import settings
+from database import FREE_DAILY_SCAN_LIMIT, PaidUser, User
+
+logger = logging.getLogger(__name__)
+
+# Counter keys expire two days out, so yesterday's keys clean themselves up
+COUNTER_TTL = 172800  # seconds
+
+# Paid status changes rarely; cache it briefly to keep the DB off the hot path
+PAID_STATUS_TTL = 60  # seconds
+_paid_cache: TTLCache = TTLCache(maxsize=10_000, ttl=PAID_STATUS_TTL)
+
+# Lazily-created Redis client, shared across requests
+_redis = None
+
+
+def _get_redis():
+    """Get the shared Redis client for quota counters."""
+    global _redis
+
+    if _redis is None:
+        import redis.asyncio as redis
+        _redis = redis.from_url(settings.redis_url, decode_responses=True)
+        logger.info("Redis scan quota enabled")
+
+    return _redis
+
+
+def _is_paid(db, user_id: str) -> bool:
+    """Check paid status, cached per worker with a short TTL."""
+    cached = _paid_cache.get(user_id)
+    if cached is not None:
+        return cached
+
+    # Presence in the tiny paid_users table is the fast check; fall back
+    # to users.is_paid for rows that predate the split
+    is_paid = db.get(PaidUser, user_id) is not None
+    if not is_paid:
+        user = db.get(User, user_id)
+        is_paid = bool(user and user.is_paid)
+
+    _paid_cache[user_id] = is_paid
+    return is_paid
+
+
+def invalidate_paid_status(user_id: str):
+    """Drop the cached paid status, e.g. right after an upgrade."""
+    _paid_cache.pop(user_id, None)
+
+
+async def try_consume_scan(db, user_id: str) -> tuple[bool, str]:
+    """
+    Atomically consume one scan from the user's daily quota in Redis.
+
+    INCR is atomic across workers, so concurrent requests can't both
+    claim the last free scan. Over-limit free users get the increment
+    handed back with a DECR.
+
+    Returns:
+        (can_scan: bool, message: str)
+    """
+    # Check if scan limits are disabled for testing
+    if settings.disable_scan_limits:
+        return True, "Scan limits disabled for testing"
+
+    # Developer/admin user always has unlimited scans
+    if user_id.startswith("admin_") or user_id.startswith("dev_"):
+        return True, "Developer unlimited scans"
+
+    redis_client = _get_redis()
+    key = f"scans:{user_id}:{date.today():%Y%m%d}"
+
+    count = await redis_client.incr(key)
+    if count == 1:
+        await redis_client.expire(key, COUNTER_TTL)
+
+    if count > FREE_DAILY_SCAN_LIMIT:
+        if _is_paid(db, user_id):
+            return True, "Unlimited scans available"
+
+        # Over the free limit: hand the reservation back
+        await redis_client.decr(key)
+        return False, "You have used your 1 free scan for today. Upgrade to get unlimited scans."
+
+    remaining = max(FREE_DAILY_SCAN_LIMIT - count, 0)
+    return True, f"Free scan available ({remaining} remaining today)"
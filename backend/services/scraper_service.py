@@ -4,10 +4,17 @@ Supports both static HTML scraping and dynamic JavaScript rendering.
 """
 
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-from typing import List, Set, Tuple, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import html as lhtml
+from urllib.parse import urljoin, urlparse, urlencode, parse_qsl
+from typing import List, Tuple, Optional
+from cachetools import TTLCache
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
+from hashlib import blake2b
 from enum import Enum
 import logging
 import re
@@ -18,6 +25,122 @@ from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Shared HTTP session: urllib3 keep-alive pooling reuses sockets across the
+# main-page fetch and the related terms-page fetches (typically same-host),
+# avoiding a fresh TCP+TLS handshake per request. Transient upstream errors
+# are retried with a short backoff.
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+})
+_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504])
+)
+_SESSION.mount('https://', _adapter)
+_SESSION.mount('http://', _adapter)
+
+# Bound the related-page fan-out so a link-heavy page can't open dozens
+# of concurrent connections to one host
+_RELATED_FETCH_WORKERS = 5
+
+# Recently scraped pages, keyed on (normalized URL, mode, max_related_pages).
+# A repeated/shared URL skips the whole static+dynamic pipeline and returns
+# in microseconds; the 1h TTL keeps results reasonably fresh.
+_SCRAPE_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+
+# Query params that vary per visitor but never change page content
+_TRACKING_PARAMS = frozenset({
+    'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content',
+    'gclid', 'fbclid', 'msclkid', 'mc_cid', 'mc_eid', 'ref'
+})
+
+
+def _normalize_url(url: str) -> str:
+    """
+    Canonicalize a URL for cache keying.
+
+    Lowercases the scheme and host, drops the fragment, and strips common
+    tracking query params so e.g. the same promo shared via different
+    campaigns hits the same cache entry.
+    """
+    parsed = urlparse(url)
+    query = urlencode([(k, v) for k, v in parse_qsl(parsed.query)
+                       if k.lower() not in _TRACKING_PARAMS])
+    return parsed._replace(
+        scheme=parsed.scheme.lower(),
+        netloc=parsed.netloc.lower(),
+        query=query,
+        fragment=''
+    ).geturl()
+
+
+# Shared headless browser for dynamic scraping. Launching Chromium costs
+# ~0.5-1.5s of process startup per call, so it's started lazily once and
+# reused. The profile is persistent on purpose: Chromium's on-disk HTTP
+# cache then serves repeat assets (JS bundles, tracker scripts that get
+# past the route filter) for the same domain without refetching them.
+# Guarded by a lock so concurrent first scrapes don't race to launch
+# two browsers.
+_PLAYWRIGHT = None
+_CONTEXT = None
+_BROWSER_LOCK = asyncio.Lock()
+
+
+async def _get_browser_context():
+    """Return the shared persistent browser context, launching it on first use."""
+    global _PLAYWRIGHT, _CONTEXT
+    async with _BROWSER_LOCK:
+        if _CONTEXT is None:
+            logger.info(f"Launching shared headless Chromium with profile {settings.browser_profile_dir}")
+            _PLAYWRIGHT = await async_playwright().start()
+            _CONTEXT = await _PLAYWRIGHT.chromium.launch_persistent_context(
+                user_data_dir=settings.browser_profile_dir,
+                headless=True,
+                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+                args=['--disable-dev-shm-usage']
+            )
+    return _CONTEXT
+
+
+async def shutdown_browser():
+    """
+    Close the shared browser and forget it.
+
+    Called from the app's shutdown hook, and from _scrape_dynamic when the
+    browser turns out to be dead so the next call relaunches it. Close
+    errors are swallowed - a crashed Chromium can't be closed cleanly.
+    """
+    global _PLAYWRIGHT, _CONTEXT
+    async with _BROWSER_LOCK:
+        if _CONTEXT is not None:
+            try:
+                await _CONTEXT.close()
+            except Exception:
+                pass
+            _CONTEXT = None
+        if _PLAYWRIGHT is not None:
+            try:
+                await _PLAYWRIGHT.stop()
+            except Exception:
+                pass
+            _PLAYWRIGHT = None
+
+
+# Resource types aborted during dynamic scraping: images, video, fonts,
+# and stylesheets don't affect extracted text but dominate network-idle
+# wait time on media-heavy promo pages
+_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font', 'stylesheet'})
+
+
+async def _abort_blocked_resources(route):
+    """Playwright route handler dropping requests for non-text resources."""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
 
 class ScraperMode(Enum):
     """Scraping mode selection."""
@@ -26,7 +149,9 @@ class ScraperMode(Enum):
     AUTO = "auto"          # Try static first, fallback to dynamic if needed
 
 
-@dataclass
+# slots drops the per-instance __dict__ (smaller, faster attribute
+# access); frozen makes results safe to share from the scrape cache
+@dataclass(slots=True, frozen=True)
 class ScrapeResult:
     """Result of a scraping operation."""
     url: str
@@ -57,17 +182,50 @@ TERMS_PATTERNS = [
     r'agreement'
 ]
 
-
-def fetch_page(url: str, timeout: int = 10) -> Tuple[str, str]:
+# JS-framework mount points (React/Next.js/Angular), matched against the
+# raw head of the document. A page carrying one of these with a nearly
+# empty body is a client-rendered shell that static scraping can't see.
+_SPA_MARKERS = re.compile(rb'id="(?:__next|root)"|ng-version')
+
+# Precompiled pattern unions: one regex scan per string instead of
+# looping over TERMS_PATTERNS (2 x ~11 searches per <a> tag adds up on
+# link-heavy pages)
+_TERMS_RE = re.compile('|'.join(TERMS_PATTERNS), re.IGNORECASE)
+
+# Single XPath union covering everything the fine-print extraction looks
+# for (footers, disclaimer sections by class/id, small text), evaluated
+# in one C-level tree traversal instead of several Python-level find_all
+# passes. Class/id matching uses the EXSLT regex extension.
+# One C-level regex scan per line for fine-print markers (*, †, ‡)
+# instead of three separate substring tests
+_FINE_PRINT_MARKERS = re.compile(r'[*†‡]')
+
+_XPATH_NS = {'re': 'http://exslt.org/regular-expressions'}
+_FINE_PRINT_XPATH = (
+    "//footer"
+    " | //div[re:test(@class, 'footer', 'i')]"
+    " | //*[self::div or self::section or self::p or self::span]"
+    "[re:test(@class, 'disclaimer|fine-?print|legal|terms', 'i')]"
+    " | //*[self::div or self::section or self::p]"
+    "[re:test(@id, 'disclaimer|fine-?print|legal|terms', 'i')]"
+    " | //small"
+)
+
+
+def fetch_page(url: str, timeout: int = 10) -> Tuple[bytes, str]:
     """
     Fetch a web page and return its content.
 
+    Returns raw bytes rather than decoded text: lxml reads the declared
+    encoding (meta charset / XML declaration) from the bytes itself, which
+    is both faster and more reliable than decoding here first.
+
     Args:
         url: URL to fetch
         timeout: Request timeout in seconds
 
     Returns:
-        Tuple of (html_content, final_url) - final_url accounts for redirects
+        Tuple of (html_bytes, final_url) - final_url accounts for redirects
     """
     try:
         # Add https:// if no protocol
@@ -76,107 +234,121 @@ def fetch_page(url: str, timeout: int = 10) -> Tuple[str, str]:
 
         logger.info(f"Fetching URL: {url}")
 
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-
-        response = requests.get(url, headers=headers, timeout=timeout, allow_redirects=True)
+        response = _SESSION.get(url, timeout=timeout, allow_redirects=True, stream=True)
         response.raise_for_status()
 
-        logger.info(f"Successfully fetched {len(response.text)} characters from {url}")
-        return response.text, response.url
+        # Don't download non-HTML responses (PDFs, images, videos that
+        # terms links occasionally point at) - nothing downstream can
+        # parse them anyway
+        content_type = response.headers.get('content-type', '')
+        if content_type and 'html' not in content_type and not content_type.startswith('text/'):
+            response.close()
+            raise Exception(f"Not an HTML page (content-type: {content_type})")
+
+        # Stream the body with a hard size cap so a pathological multi-MB
+        # page can't blow memory or stall the worker; fine print lives in
+        # the first couple MB of any sane page
+        chunks = []
+        total = 0
+        for chunk in response.iter_content(65536):
+            chunks.append(chunk)
+            total += len(chunk)
+            if total > settings.max_html_bytes:
+                logger.warning(f"Page exceeds {settings.max_html_bytes} bytes, truncating download of {url}")
+                response.close()
+                break
+
+        logger.info(f"Successfully fetched {total} bytes from {url}")
+        return b''.join(chunks), response.url
 
     except requests.exceptions.RequestException as e:
         logger.error(f"Failed to fetch {url}: {str(e)}")
         raise Exception(f"Failed to fetch webpage: {str(e)}")
 
 
-def extract_fine_print_sections(soup: BeautifulSoup) -> str:
+def extract_fine_print_sections(tree, full_text: Optional[str] = None) -> str:
     """
-    Extract fine print sections from a BeautifulSoup object.
+    Extract fine print sections from a parsed lxml tree.
 
     Looks for:
     - Footer content
     - Elements with classes/ids containing 'disclaimer', 'terms', 'fine-print', etc.
     - Small text (often used for disclaimers)
     - Asterisks and dagger symbols (common in fine print)
+
+    Args:
+        tree: Parsed lxml tree of the page
+        full_text: Newline-joined text of the page if the caller already
+            computed it, avoiding a second full-tree walk
     """
-    fine_print_text = []
-
-    # 1. Footer content
-    footers = soup.find_all(['footer', 'div'], class_=re.compile(r'footer', re.I))
-    for footer in footers:
-        text = footer.get_text(separator=' ', strip=True)
-        if text:
-            fine_print_text.append(text)
-
-    # 2. Disclaimer sections
-    disclaimers = soup.find_all(['div', 'section', 'p', 'span'],
-                                class_=re.compile(r'disclaimer|fine-?print|legal|terms', re.I))
-    for disclaimer in disclaimers:
-        text = disclaimer.get_text(separator=' ', strip=True)
-        if text:
-            fine_print_text.append(text)
-
-    disclaimers_by_id = soup.find_all(['div', 'section', 'p'],
-                                      id=re.compile(r'disclaimer|fine-?print|legal|terms', re.I))
-    for disclaimer in disclaimers_by_id:
-        text = disclaimer.get_text(separator=' ', strip=True)
-        if text:
-            fine_print_text.append(text)
-
-    # 3. Small text (often disclaimers)
-    small_texts = soup.find_all('small')
-    for small in small_texts:
-        text = small.get_text(separator=' ', strip=True)
-        if text:
-            fine_print_text.append(text)
+    # 1-3. Footers, disclaimer sections, and small text in one XPath
+    # pass, materialized with a comprehension (runs the loop at C level,
+    # no per-node .append lookup)
+    node_texts = (' '.join(node.text_content().split())
+                  for node in tree.xpath(_FINE_PRINT_XPATH, namespaces=_XPATH_NS))
+    fine_print_text = [text for text in node_texts if text]
 
     # 4. Text with asterisks or daggers (common fine print markers)
-    all_text = soup.get_text(separator='\n')
-    asterisk_lines = [line.strip() for line in all_text.split('\n')
-                      if '*' in line or '†' in line or '‡' in line]
+    if full_text is None:
+        full_text = '\n'.join(tree.itertext())
+    asterisk_lines = [line.strip() for line in full_text.splitlines()
+                      if _FINE_PRINT_MARKERS.search(line)]
     fine_print_text.extend(asterisk_lines)
 
     return '\n'.join(fine_print_text)
 
 
-def find_terms_links(soup: BeautifulSoup, base_url: str) -> List[str]:
+# Canonical legal-page paths/labels: a bare /terms or /privacy link is a
+# far stronger signal than a nav blob that merely mentions 'legal'
+_HIGH_SIGNAL_NAMES = frozenset({'terms', 'privacy', 'legal', 'tos', 'eula'})
+
+
+def find_terms_links(tree, base_url: str) -> List[str]:
     """
     Find links to terms & conditions, privacy policy, and related pages.
 
+    Links are ranked by match specificity so callers slicing the first N
+    spend their fetch budget on the most informative pages.
+
     Args:
-        soup: BeautifulSoup object of the page
+        tree: Parsed lxml tree of the page
         base_url: Base URL for resolving relative links
 
     Returns:
-        List of absolute URLs to terms pages
+        List of absolute URLs to terms pages, highest-signal first
     """
-    links = []
-    found_urls: Set[str] = set()
+    # url -> score; dict keys double as an insertion-ordered set, so one
+    # structure handles dedup, ordering, and ranking
+    seen: dict = {}
 
     # Find all links
-    for link in soup.find_all('a', href=True):
-        href = link['href']
-        link_text = link.get_text(strip=True).lower()
+    for link in tree.xpath('//a[@href]'):
+        href = link.get('href')
+        link_text = link.text_content().strip().lower()
 
         # Check if link text or href matches terms patterns
-        is_terms_link = any(
-            re.search(pattern, link_text, re.I) or re.search(pattern, href, re.I)
-            for pattern in TERMS_PATTERNS
-        )
-
-        if is_terms_link:
-            # Convert to absolute URL
+        if _TERMS_RE.search(link_text) or _TERMS_RE.search(href):
+            # Convert to absolute URL and keep only real web links
+            # (startswith('http') would also admit javascript:/mailto:
+            # hrefs mangled into odd absolute forms)
             absolute_url = urljoin(base_url, href)
+            if urlparse(absolute_url).scheme not in ('http', 'https'):
+                continue
 
-            # Avoid duplicates and non-HTTP links
-            if absolute_url not in found_urls and absolute_url.startswith('http'):
-                found_urls.add(absolute_url)
-                links.append(absolute_url)
+            # Exact /terms-style paths and link labels beat incidental
+            # pattern hits; each extra pattern match adds a little
+            score = len(_TERMS_RE.findall(link_text)) + len(_TERMS_RE.findall(href))
+            if urlparse(absolute_url).path.strip('/').lower() in _HIGH_SIGNAL_NAMES:
+                score += 3
+            if link_text in _HIGH_SIGNAL_NAMES:
+                score += 2
 
-    logger.info(f"Found {len(links)} terms-related links")
-    return links
+            if score > seen.get(absolute_url, -1):
+                seen[absolute_url] = score
+
+    logger.info(f"Found {len(seen)} terms-related links")
+    # Stable sort: ties keep document order
+    return sorted(seen, key=seen.get, reverse=True)
 
 
 def _scrape_static(url: str, max_related_pages: int = 5) -> ScrapeResult:
@@ -193,35 +365,73 @@ def _scrape_static(url: str, max_related_pages: int = 5) -> ScrapeResult:
     all_text = []
 
     try:
-        # Fetch main page
+        # Fetch main page and parse once with lxml (C-level traversal)
         html, final_url = fetch_page(url)
-        soup = BeautifulSoup(html, 'lxml')
+        tree = lhtml.fromstring(html)
+
+        # Walk the text nodes once; the marker scan and the full-page
+        # context below both reuse this string instead of re-walking
+        # the whole tree
+        full_text = '\n'.join(tree.itertext())
+
+        # SPA shells render client-side, so the section extraction and
+        # related-link crawl below would just chew on an empty document.
+        # Return the (short) body text immediately - in AUTO mode that
+        # falls straight through to the dynamic scraper.
+        if _SPA_MARKERS.search(html[:16384]):
+            body_text = ' '.join(full_text.split())
+            if len(body_text) < settings.static_content_threshold:
+                logger.info(f"JS framework shell detected for {final_url} ({len(body_text)} chars of body text), "
+                            f"skipping static extraction")
+                return ScrapeResult(
+                    url=url,
+                    final_url=final_url,
+                    content=body_text,
+                    char_count=len(body_text),
+                    mode_used=ScraperMode.STATIC,
+                    success=True
+                )
 
         # Extract main page content
-        main_text = extract_fine_print_sections(soup)
+        main_text = extract_fine_print_sections(tree, full_text)
         if main_text:
             all_text.append(f"=== MAIN PAGE ({final_url}) ===\n{main_text}")
 
-        # Also get full page text for context
-        full_text = soup.get_text(separator=' ', strip=True)
-        all_text.append(f"\n=== FULL PAGE CONTENT ===\n{full_text}")
+        # Fall back to the full page text only when section extraction
+        # came up short - it's a near-superset of the sections, so
+        # including both roughly doubles the text downstream cleaning
+        # and the model have to chew through
+        if len(main_text) < settings.static_content_threshold:
+            all_text.append(f"\n=== FULL PAGE CONTENT ===\n{' '.join(full_text.split())}")
 
         # Find and scrape related terms pages
-        terms_links = find_terms_links(soup, final_url)
-
-        for i, terms_url in enumerate(terms_links[:max_related_pages]):
-            try:
-                logger.info(f"Scraping related page {i+1}/{len(terms_links)}: {terms_url}")
-                terms_html, _ = fetch_page(terms_url)
-                terms_soup = BeautifulSoup(terms_html, 'lxml')
+        terms_links = find_terms_links(tree, final_url)
 
-                # Get full text from terms page
-                terms_text = terms_soup.get_text(separator=' ', strip=True)
-                all_text.append(f"\n=== TERMS PAGE ({terms_url}) ===\n{terms_text}")
+        # Fetch related pages concurrently: each is network-bound, so
+        # wall-clock time drops from the sum of page latencies to roughly
+        # the slowest single page
+        selected_links = terms_links[:max_related_pages]
+        if selected_links:
+            logger.info(f"Scraping {len(selected_links)} related pages concurrently")
 
-            except Exception as e:
-                logger.warning(f"Failed to scrape {terms_url}: {str(e)}")
-                continue
+            def _fetch_terms_text(terms_url: str) -> str:
+                terms_html, _ = fetch_page(terms_url)
+                terms_tree = lhtml.fromstring(terms_html)
+                # itertext() yields each text node separately, so joining
+                # on a space keeps words from adjacent tags apart (matching
+                # the old get_text(separator=' ') behavior)
+                return ' '.join(' '.join(terms_tree.itertext()).split())
+
+            with ThreadPoolExecutor(max_workers=_RELATED_FETCH_WORKERS) as executor:
+                futures = [executor.submit(_fetch_terms_text, u) for u in selected_links]
+
+            for terms_url, future in zip(selected_links, futures):
+                try:
+                    terms_text = future.result()
+                    all_text.append(f"\n=== TERMS PAGE ({terms_url}) ===\n{terms_text}")
+                except Exception as e:
+                    logger.warning(f"Failed to scrape {terms_url}: {str(e)}")
+                    continue
 
         combined_text = '\n\n'.join(all_text)
         char_count = len(combined_text)
@@ -262,55 +472,73 @@ async def _scrape_dynamic(url: str) -> ScrapeResult:
     try:
         logger.info(f"Starting dynamic scraping with Playwright for {url}")
 
-        async with async_playwright() as p:
-            # Launch headless Chromium
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-            )
+        context = await _get_browser_context()
+        try:
+            page = await context.new_page()
+        except Exception:
+            # The shared Chromium can die between scrapes (e.g. OOM-killed
+            # in a container). Discard the dead instance and relaunch once
+            # rather than leaving dynamic scraping broken until restart.
+            logger.warning(f"Shared browser unavailable, relaunching for {url}")
+            await shutdown_browser()
+            context = await _get_browser_context()
             page = await context.new_page()
 
+        # Abort image/media/font/stylesheet requests before navigating:
+        # they don't contribute to the extracted text but keep the
+        # network busy for seconds on media-heavy pages
+        await page.route('**/*', _abort_blocked_resources)
+
+        try:
+            # Navigate up to DOM-ready, then give remaining requests a
+            # short window to settle. With heavy resources blocked,
+            # network idle arrives quickly; if stragglers (analytics,
+            # long-polling) never settle, proceed with what rendered.
+            await page.goto(url, timeout=settings.dynamic_scraping_timeout * 1000, wait_until='domcontentloaded')
             try:
-                # Navigate and wait for network to be idle
-                await page.goto(url, timeout=settings.dynamic_scraping_timeout * 1000, wait_until='networkidle')
+                await page.wait_for_load_state('networkidle', timeout=5000)
+            except PlaywrightTimeout:
+                logger.info(f"Network did not go idle within 5s for {url}, using current DOM")
 
-                # Get final URL after redirects
-                final_url = page.url
+            # Get final URL after redirects
+            final_url = page.url
 
-                # Extract rendered HTML
-                html_content = await page.content()
+            # Extract rendered HTML
+            html_content = await page.content()
 
-                # Parse with BeautifulSoup
-                soup = BeautifulSoup(html_content, 'lxml')
+            # Parse with lxml (C-level traversal, no bs4 wrapper objects)
+            tree = lhtml.fromstring(html_content)
 
-                # Extract text content
-                text_content = soup.get_text(separator=' ', strip=True)
-                char_count = len(text_content)
+            # Extract text content, one space between adjacent text nodes
+            text_content = ' '.join(' '.join(tree.itertext()).split())
+            char_count = len(text_content)
 
-                logger.info(f"Dynamic scraping complete: {char_count} characters from {final_url}")
+            logger.info(f"Dynamic scraping complete: {char_count} characters from {final_url}")
 
-                result = ScrapeResult(
-                    url=url,
-                    final_url=final_url,
-                    content=f"=== DYNAMIC PAGE ({final_url}) ===\n{text_content}",
-                    char_count=char_count,
-                    mode_used=ScraperMode.DYNAMIC,
-                    success=True
-                )
+            result = ScrapeResult(
+                url=url,
+                final_url=final_url,
+                content=f"=== DYNAMIC PAGE ({final_url}) ===\n{text_content}",
+                char_count=char_count,
+                mode_used=ScraperMode.DYNAMIC,
+                success=True
+            )
 
-            except PlaywrightTimeout:
-                logger.error(f"Dynamic scraping timeout after {settings.dynamic_scraping_timeout}s for {url}")
-                result = ScrapeResult(
-                    url=url,
-                    final_url=url,
-                    content="",
-                    char_count=0,
-                    mode_used=ScraperMode.DYNAMIC,
-                    success=False,
-                    error=f"Timeout after {settings.dynamic_scraping_timeout} seconds"
-                )
-            finally:
-                await browser.close()
+        except PlaywrightTimeout:
+            logger.error(f"Dynamic scraping timeout after {settings.dynamic_scraping_timeout}s for {url}")
+            result = ScrapeResult(
+                url=url,
+                final_url=url,
+                content="",
+                char_count=0,
+                mode_used=ScraperMode.DYNAMIC,
+                success=False,
+                error=f"Timeout after {settings.dynamic_scraping_timeout} seconds"
+            )
+        finally:
+            # Close only the per-scrape page; the shared persistent
+            # context keeps its HTTP cache warm for the next request
+            await page.close()
 
         return result
 
@@ -331,6 +559,9 @@ async def scrape_page_async(url: str, mode: ScraperMode = ScraperMode.AUTO, max_
     """
     Async version of main scraping orchestrator.
 
+    Successful results are memoized by normalized URL for an hour, so
+    repeated scans of the same page skip the network entirely.
+
     Args:
         url: URL to scrape
         mode: Scraping mode (STATIC, DYNAMIC, or AUTO)
@@ -339,20 +570,39 @@ async def scrape_page_async(url: str, mode: ScraperMode = ScraperMode.AUTO, max_
     Returns:
         ScrapeResult with scraped content
     """
+    cache_key = (_normalize_url(url), mode, max_related_pages)
+    cached = _SCRAPE_CACHE.get(cache_key)
+    if cached is not None:
+        logger.info(f"Returning cached scrape result for {url}")
+        return cached
+
+    result = await _scrape_page_uncached(url, mode, max_related_pages)
+
+    # Only cache successes - failures may be transient (timeouts, 5xx)
+    if result.success:
+        _SCRAPE_CACHE[cache_key] = result
+    return result
+
+
+async def _scrape_page_uncached(url: str, mode: ScraperMode, max_related_pages: int) -> ScrapeResult:
+    """Run the actual scraping pipeline for a cache miss."""
     logger.info(f"Starting scrape_page for {url} with mode={mode.value}")
 
+    # _scrape_static does blocking requests calls, so it runs in a worker
+    # thread - otherwise one slow static scrape stalls every other
+    # coroutine on the event loop (including concurrent dynamic scrapes)
     if mode == ScraperMode.STATIC:
-        return _scrape_static(url, max_related_pages)
+        return await asyncio.to_thread(_scrape_static, url, max_related_pages)
 
     elif mode == ScraperMode.DYNAMIC:
         if not settings.enable_dynamic_scraping:
             logger.warning("Dynamic scraping is disabled in settings, falling back to static")
-            return _scrape_static(url, max_related_pages)
+            return await asyncio.to_thread(_scrape_static, url, max_related_pages)
         return await _scrape_dynamic(url)
 
     elif mode == ScraperMode.AUTO:
         # Try static first
-        result = _scrape_static(url, max_related_pages)
+        result = await asyncio.to_thread(_scrape_static, url, max_related_pages)
 
         # Check if result appears incomplete
         if result.success and result.is_likely_incomplete:
@@ -423,6 +673,45 @@ def scrape_url(url: str, max_related_pages: int = 5) -> str:
     return result.content
 
 
+# Near-duplicate sentence detection: multi-page terms scrapes repeat the
+# same clauses with tiny edits, which exact-match dedup can't catch but
+# inflates downstream LLM token cost. Sentences whose 64-bit SimHash is
+# within this hamming distance of an already-kept sentence are dropped.
+_SIMHASH_HAMMING_THRESHOLD = 4
+_SIMHASH_MAX_KEPT = 4096  # cap comparisons per sentence
+
+
+@lru_cache(maxsize=65536)
+def _shingle_hash(shingle: str) -> int:
+    """
+    Stable 64-bit hash of a 3-char shingle.
+
+    Uses blake2b rather than builtin hash(), which is salted per process
+    and would make dedup results vary between runs. Cached because the
+    same short shingles recur constantly across sentences.
+    """
+    return int.from_bytes(blake2b(shingle.encode(), digest_size=8).digest(), 'big')
+
+
+def _simhash(sentence: str) -> int:
+    """64-bit SimHash over 3-char shingles of the lowercased sentence."""
+    weights = [0] * 64
+    s = sentence.lower()
+    for i in range(max(len(s) - 2, 1)):
+        h = _shingle_hash(s[i:i + 3])
+        for bit in range(64):
+            if (h >> bit) & 1:
+                weights[bit] += 1
+            else:
+                weights[bit] -= 1
+
+    fingerprint = 0
+    for bit in range(64):
+        if weights[bit] > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
 def clean_and_deduplicate_text(text: str, max_length: int = 100000) -> str:
     """
     Clean and deduplicate scraped text.
@@ -434,19 +723,37 @@ def clean_and_deduplicate_text(text: str, max_length: int = 100000) -> str:
     Returns:
         Cleaned text, truncated if necessary
     """
-    # Remove excessive whitespace
-    text = re.sub(r'\s+', ' ', text)
-
-    # Remove duplicate sentences (simple approach)
-    sentences = text.split('.')
+    # Bound the cleaning pass to O(max_length): text beyond twice the
+    # final cap can't survive the truncation below anyway, so don't pay
+    # to collapse, split, and fingerprint it (dynamic scrapes of huge
+    # DOMs can produce multi-MB strings)
+    if len(text) > max_length * 2:
+        logger.warning(f"Input text very long ({len(text)} chars), pre-truncating to {max_length * 2}")
+        text = text[:max_length * 2]
+
+    # Remove excessive whitespace (str.split/join runs at C level,
+    # no regex engine needed)
+    text = ' '.join(text.split())
+
+    # Remove duplicate and near-duplicate sentences. The exact-match set
+    # filters byte-identical repeats cheaply; SimHash then drops
+    # boilerplate variants that differ by only a few characters.
     seen = set()
+    kept_fingerprints: deque = deque(maxlen=_SIMHASH_MAX_KEPT)
     unique_sentences = []
 
-    for sentence in sentences:
-        sentence = sentence.strip()
-        if sentence and sentence not in seen and len(sentence) > 10:
-            seen.add(sentence)
-            unique_sentences.append(sentence)
+    for sentence in (s.strip() for s in text.split('.')):
+        if len(sentence) <= 10 or sentence in seen:
+            continue
+        seen.add(sentence)
+
+        fingerprint = _simhash(sentence)
+        if any((fingerprint ^ kept).bit_count() < _SIMHASH_HAMMING_THRESHOLD
+               for kept in kept_fingerprints):
+            continue
+
+        kept_fingerprints.append(fingerprint)
+        unique_sentences.append(sentence)
 
     cleaned = '. '.join(unique_sentences)
 